@@ -1,5 +1,7 @@
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.db.models import Count
+from django.db.models.functions import Now
 from django.urls import reverse
 
 User = get_user_model()
@@ -19,6 +21,18 @@ class BaseModel(models.Model):
         abstract = True
 
 
+class PostQuerySet(models.QuerySet):
+    def published(self):
+        return self.filter(
+            pub_date__lt=Now(),
+            is_published=True,
+            category__is_published=True,
+        )
+
+    def with_comment_count(self):
+        return self.annotate(comment_count=Count("comments__post_id"))
+
+
 class Post(BaseModel):
     title = models.CharField(max_length=256, verbose_name="Заголовок")
     text = models.TextField(null=True, verbose_name="Текст")
@@ -52,11 +66,23 @@ class Post(BaseModel):
         verbose_name="Изображение",
     )
 
+    objects = PostQuerySet.as_manager()
+
     class Meta:
         verbose_name = "публикация"
         verbose_name_plural = "Публикации"
         default_related_name = "posts"
         ordering = ("-pub_date",)
+        indexes = (
+            models.Index(fields=("-pub_date",), name="post_pubdate_desc"),
+            models.Index(
+                fields=("is_published", "category", "-pub_date"),
+                name="post_pub_cat_date",
+            ),
+            models.Index(
+                fields=("author", "-pub_date"), name="post_author_date"
+            ),
+        )
 
     def get_absolute_url(self):
         return reverse('blog:detail.html', kwargs={'pk': self.pk})
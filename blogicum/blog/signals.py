@@ -0,0 +1,26 @@
+from uuid import uuid4
+
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+
+from .models import Category, Comment, Location, Post, User
+
+POSTS_CACHE_VERSION_KEY = "blog:posts_cache_version"
+
+
+def get_posts_cache_version():
+    return cache.get_or_set(
+        POSTS_CACHE_VERSION_KEY, lambda: uuid4().hex, None
+    )
+
+
+def bump_posts_cache_version(sender, update_fields=None, **kwargs):
+    # A login only touches User.last_login, which no cached page shows.
+    if update_fields == {"last_login"}:
+        return
+    cache.set(POSTS_CACHE_VERSION_KEY, uuid4().hex, None)
+
+
+for model in (Post, Comment, Category, Location, User):
+    post_save.connect(bump_posts_cache_version, sender=model)
+    post_delete.connect(bump_posts_cache_version, sender=model)
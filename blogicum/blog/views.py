@@ -1,8 +1,14 @@
+from collections.abc import Sequence
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Count, Prefetch, Q
+from django.core.paginator import Paginator
+from django.db.models import Prefetch, Q
+from django.http import Http404
 from django.shortcuts import get_object_or_404, redirect
-from django.urls import reverse, reverse_lazy
-from django.utils import timezone
+from django.urls import get_script_prefix, reverse, reverse_lazy
+from django.views.decorators.cache import cache_page
 from django.views.generic import (
     CreateView,
     DeleteView,
@@ -13,35 +19,179 @@ from django.views.generic import (
 
 from .forms import CommentForm, PostForm, UserForm
 from .models import Category, Comment, Post, User
+from .signals import get_posts_cache_version
 
 POSTS_PER_PAGE = 10
+POSTS_CACHE_TIMEOUT = 60
+POST_CARD_FIELDS = (
+    "title",
+    "text",
+    "pub_date",
+    "image",
+    "is_published",
+    "author__username",
+    "category__title",
+    "category__slug",
+    "category__is_published",
+    "location__name",
+    "location__is_published",
+)
+CURSOR_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+MAX_CURSOR_ID = 2 ** 63 - 1
+
+
+@lru_cache(maxsize=16)
+def _post_detail_url_parts(script_prefix):
+    """Split the post detail URL around its pk segment.
+
+    The pk is reversed as 0 and split on the last "/0/" only, because the
+    pk is the final path segment. The script prefix is passed in so each
+    prefix gets its own cache entry. Returns None if the URL has no "/0/"
+    segment to split on.
+    """
+    head, separator, tail = reverse(
+        "blog:post_detail", kwargs={"pk": 0}
+    ).rpartition("/0/")
+    if not separator:
+        return None
+    return head, tail
+
+
+def _post_detail_url(pk):
+    parts = _post_detail_url_parts(get_script_prefix())
+    if parts is None:
+        return reverse("blog:post_detail", kwargs={"pk": pk})
+    head, tail = parts
+    return f"{head}/{pk}/{tail}"
+
+
+def _encode_post_cursor(post):
+    micros = (post.pub_date - CURSOR_EPOCH) // timedelta(microseconds=1)
+    return f"{micros}_{post.pk}"
+
+
+def _decode_post_cursor(value):
+    """Return the (pub_date, pk) pair encoded by _encode_post_cursor."""
+    try:
+        micros, pk = (int(part) for part in value.split("_"))
+        pub_date = CURSOR_EPOCH + timedelta(microseconds=micros)
+    except (ValueError, OverflowError):
+        raise Http404
+    if not 0 < pk <= MAX_CURSOR_ID:
+        raise Http404
+    return pub_date, pk
+
+
+class PostPaginator(Paginator):
+    """Paginator for post querysets built without comment_count.
+
+    The total is counted over the bare filtered queryset, and the
+    comment_count annotation is applied to the page slice only, so the
+    count query carries neither the comment join nor a GROUP BY.
+    """
+
+    def page(self, number):
+        page = super().page(number)
+        page.object_list = page.object_list.with_comment_count()
+        return page
+
+
+class PostCursorPage(Sequence):
+    """Page of a feed paginated by a cursor instead of a page number."""
 
+    def __init__(self, object_list, next_cursor, is_first):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.is_first = is_first
 
-class IndexView(ListView):
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return not self.is_first
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class AnonymousCacheMixin:
+    """Serve cached pages to anonymous users.
+
+    The cache key prefix follows the posts cache version, which is bumped
+    whenever posts, comments, categories, locations or users change.
+    The version lives in the default cache, so with the per-process
+    LocMemCache a bump only reaches the process that handled the save;
+    multi-process deployments need a shared cache backend.
+    """
+
+    cache_timeout = POSTS_CACHE_TIMEOUT
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.user.is_authenticated:
+            return super().dispatch(request, *args, **kwargs)
+        return cache_page(
+            self.cache_timeout, key_prefix=get_posts_cache_version()
+        )(super().dispatch)(request, *args, **kwargs)
+
+
+class IndexView(AnonymousCacheMixin, ListView):
     model = Post
     template_name = "blog/index.html"
     paginate_by = POSTS_PER_PAGE
+    cursor_kwarg = "after"
 
     def get_queryset(self):
         return (
-            Post.objects.select_related(
+            Post.objects.published()
+            .select_related(
                 "author",
                 "category",
                 "location",
             )
-            .filter(
-                pub_date__lt=timezone.now(),
-                is_published=True,
-                category__is_published=True,
+            .only(*POST_CARD_FIELDS)
+            .order_by("-pub_date", "-pk")
+        )
+
+    def get(self, request, *args, **kwargs):
+        # Numbered pages are gone; send old ?page=N links to the feed start.
+        if self.page_kwarg in request.GET:
+            return redirect("blog:index")
+        return super().get(request, *args, **kwargs)
+
+    def paginate_queryset(self, queryset, page_size):
+        """Return the posts ordered after the (pub_date, pk) cursor.
+
+        Seeking past the cursor keeps deep pages as cheap as the first
+        one, unlike OFFSET which scans and drops every preceding row.
+        The cursor carries both values, so no lookup is needed and the
+        feed continues even if the cursor post is gone.
+        """
+        after = self.request.GET.get(self.cursor_kwarg)
+        if after:
+            pub_date, pk = _decode_post_cursor(after)
+            queryset = queryset.filter(
+                Q(pub_date__lt=pub_date) | Q(pub_date=pub_date, pk__lt=pk)
             )
-            .annotate(comment_count=Count("comments"))
-            .order_by("-pub_date")
+        posts = list(queryset.with_comment_count()[:page_size + 1])
+        next_cursor = (
+            _encode_post_cursor(posts[page_size - 1])
+            if len(posts) > page_size
+            else None
         )
+        page = PostCursorPage(posts[:page_size], next_cursor, not after)
+        return None, page, page.object_list, page.has_other_pages()
 
 
-class ProfileListView(ListView):
+class ProfileListView(AnonymousCacheMixin, ListView):
     template_name = "blog/profile.html"
     paginate_by = POSTS_PER_PAGE
+    paginator_class = PostPaginator
 
     def get_object(self, queryset=None):
         return self.request.user
@@ -52,35 +202,28 @@ class ProfileListView(ListView):
         return context
 
     def get_queryset(self):
-        post_list = User.objects.prefetch_related(
-            Prefetch(
-                "posts",
-                queryset=(
-                    Post.objects.select_related(
-                        "author",
-                        "category",
-                        "location",
-                    )
-                    .filter(
-                        Q(author__username=self.kwargs["username"])
-                        | Q(pub_date__lte=timezone.now(), is_published=True,
-                            category__is_published=True)
-                    )
-                    .annotate(comment_count=Count("comments"))
-                    .order_by("-pub_date")
-                ),
-            )
-        )
         self.profile = get_object_or_404(
-            post_list, username=self.kwargs.get("username")
+            User, username=self.kwargs["username"]
+        )
+        post_list = (
+            Post.objects.select_related(
+                "author",
+                "category",
+                "location",
+            )
+            .only(*POST_CARD_FIELDS)
+            .filter(author=self.profile)
         )
-        return self.profile.posts.all()
+        if self.request.user.pk != self.profile.pk:
+            post_list = post_list.published()
+        return post_list.order_by("-pub_date")
 
 
-class CategoryListView(ListView):
+class CategoryListView(AnonymousCacheMixin, ListView):
     model = Post
     template_name = "blog/category.html"
     paginate_by = POSTS_PER_PAGE
+    paginator_class = PostPaginator
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -98,12 +241,9 @@ class CategoryListView(ListView):
         )
 
         return (
-            category.posts.select_related("category", "author", "location")
-            .filter(
-                pub_date__lt=timezone.now(),
-                is_published=True,
-            )
-            .annotate(comment_count=Count("comments"))
+            category.posts.published()
+            .select_related("category", "author", "location")
+            .only(*POST_CARD_FIELDS)
             .order_by("-pub_date")
         )
 
@@ -112,10 +252,26 @@ class PostDetailView(DetailView):
     model = Post
     template_name = "blog/detail.html"
 
+    def get_queryset(self):
+        return (
+            Post.objects.select_related(
+                "author",
+                "category",
+                "location",
+            )
+            .prefetch_related(
+                Prefetch(
+                    "comments",
+                    queryset=Comment.objects.select_related("author"),
+                    to_attr="comment_list",
+                )
+            )
+        )
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context["form"] = CommentForm()
-        context["comments"] = self.object.comments.select_related("author")
+        context["comments"] = self.object.comment_list
         return context
 
 
@@ -158,14 +314,15 @@ class PostUpdateView(LoginRequiredMixin, UpdateView):
 
     def dispatch(self, request, *args, **kwargs):
         self.post_obj = get_object_or_404(Post, pk=kwargs.get("pk"))
-        if self.post_obj.author != request.user:
+        if self.post_obj.author_id != request.user.pk:
             return redirect("blog:post_detail", self.kwargs.get("pk"))
         return super().dispatch(request, *args, **kwargs)
 
+    def get_object(self, queryset=None):
+        return self.post_obj
+
     def get_success_url(self):
-        return reverse_lazy(
-            "blog:post_detail", kwargs={"pk": self.post_obj.pk}
-        )
+        return _post_detail_url(self.post_obj.pk)
 
 
 class PostDeleteView(LoginRequiredMixin, DeleteView):
@@ -173,26 +330,31 @@ class PostDeleteView(LoginRequiredMixin, DeleteView):
     template_name = "blog/create.html"
     success_url = reverse_lazy("blog:index")
     pk_url_kwarg = "pk"
+    post_obj = None
 
     def dispatch(self, request, *args, **kwargs):
-        post = get_object_or_404(Post, pk=kwargs.get("pk"))
-        if post.author != request.user:
+        self.post_obj = get_object_or_404(Post, pk=kwargs.get("pk"))
+        if self.post_obj.author_id != request.user.pk:
             return redirect("blog:post_detail", self.kwargs.get("pk"))
         return super().dispatch(request, *args, **kwargs)
 
+    def get_object(self, queryset=None):
+        return self.post_obj
+
 
 class CommentCreateView(LoginRequiredMixin, CreateView):
     model = Comment
     form_class = CommentForm
 
     def form_valid(self, form):
-        comment = get_object_or_404(Post, pk=self.kwargs["pk"])
+        if not Post.objects.filter(pk=self.kwargs["pk"]).exists():
+            raise Http404
         form.instance.author = self.request.user
-        form.instance.post = comment
+        form.instance.post_id = self.kwargs["pk"]
         return super().form_valid(form)
 
     def get_success_url(self):
-        return reverse("blog:post_detail", kwargs={"pk": self.kwargs["pk"]})
+        return _post_detail_url(self.kwargs["pk"])
 
 
 class CommentUpdateView(LoginRequiredMixin, UpdateView):
@@ -200,15 +362,21 @@ class CommentUpdateView(LoginRequiredMixin, UpdateView):
     template_name = "blog/comment.html"
     form_class = CommentForm
     pk_url_kwarg = "comment_pk"
+    comment_obj = None
 
     def dispatch(self, request, *args, **kwargs):
-        comment = get_object_or_404(Comment, pk=kwargs["comment_pk"])
-        if comment.author != request.user:
-            return redirect("blog:post_detail", comment.pk)
+        self.comment_obj = get_object_or_404(
+            Comment, pk=kwargs["comment_pk"]
+        )
+        if self.comment_obj.author_id != request.user.pk:
+            return redirect("blog:post_detail", self.comment_obj.post_id)
         return super().dispatch(request, *args, **kwargs)
 
+    def get_object(self, queryset=None):
+        return self.comment_obj
+
     def get_success_url(self):
-        return reverse("blog:post_detail", kwargs={"pk": self.kwargs["pk"]})
+        return _post_detail_url(self.kwargs["pk"])
 
 
 class CommentDeleteView(LoginRequiredMixin, DeleteView):
@@ -216,9 +384,15 @@ class CommentDeleteView(LoginRequiredMixin, DeleteView):
     template_name = "blog/comment.html"
     success_url = reverse_lazy("blog:index")
     pk_url_kwarg = "comment_pk"
+    comment_obj = None
 
     def dispatch(self, request, *args, **kwargs):
-        comment = get_object_or_404(Comment, pk=kwargs["comment_pk"])
-        if comment.author != request.user:
-            return redirect("blog:post_detail", pk=kwargs["pk"])
+        self.comment_obj = get_object_or_404(
+            Comment, pk=kwargs["comment_pk"]
+        )
+        if self.comment_obj.author_id != request.user.pk:
+            return redirect("blog:post_detail", self.comment_obj.post_id)
         return super().dispatch(request, *args, **kwargs)
+
+    def get_object(self, queryset=None):
+        return self.comment_obj
@@ -0,0 +1,91 @@
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.utils import timezone
+
+from blog.signals import get_posts_cache_version
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def published_post(mixer, user, published_category):
+    return mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() - timedelta(days=1))
+
+
+@pytest.mark.parametrize('url_name', ('index', 'category', 'profile'))
+def test_anonymous_pages_cached(
+        client, django_assert_num_queries, published_post, url_name):
+    url = {
+        'index': '/',
+        'category': f'/category/{published_post.category.slug}/',
+        'profile': f'/profile/{published_post.author.username}/',
+    }[url_name]
+    first = client.get(url)
+    with django_assert_num_queries(0):
+        second = client.get(url)
+    assert second.content == first.content, (
+        'Убедитесь, что анонимному пользователю повторно отдаётся '
+        'закешированная страница.'
+    )
+
+
+def test_authenticated_pages_not_cached(
+        user_client, published_post):
+    user_client.get('/')
+    response = user_client.get('/')
+    assert response.context is not None, (
+        'Убедитесь, что авторизованному пользователю страница '
+        'не отдаётся из кеша.'
+    )
+
+
+def test_post_save_invalidates_cache(
+        client, mixer, user, published_post):
+    client.get('/')
+    new_post = mixer.blend(
+        'blog.Post', author=user, category=published_post.category,
+        is_published=True, pub_date=timezone.now() - timedelta(hours=1))
+    response = client.get('/')
+    assert new_post.title in response.content.decode('utf-8'), (
+        'Убедитесь, что кеш страниц сбрасывается при сохранении публикации.'
+    )
+
+
+def test_comment_invalidates_cache(client, mixer, user, published_post):
+    version = get_posts_cache_version()
+    mixer.blend('blog.Comment', post=published_post, author=user)
+    assert get_posts_cache_version() != version, (
+        'Убедитесь, что кеш страниц сбрасывается при добавлении '
+        'комментария.'
+    )
+
+
+def test_login_keeps_cache(client, user):
+    version = get_posts_cache_version()
+    client.force_login(user)
+    assert get_posts_cache_version() == version, (
+        'Убедитесь, что вход пользователя не сбрасывает кеш страниц.'
+    )
+
+
+def test_profile_edit_invalidates_cache(user):
+    version = get_posts_cache_version()
+    user.first_name = 'Иван'
+    user.save()
+    assert get_posts_cache_version() != version, (
+        'Убедитесь, что кеш страниц сбрасывается при изменении '
+        'профиля пользователя.'
+    )
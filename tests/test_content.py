@@ -1,5 +1,7 @@
 import inspect
 from abc import abstractmethod
+from datetime import timedelta
+from http import HTTPStatus
 from typing import Type, Optional, Callable, List, Tuple, Union
 
 import pytest
@@ -8,6 +10,7 @@ from bs4.element import SoupStrainer
 from django.db.models import Model
 from django.http import HttpResponse
 from django.test.client import Client
+from django.utils import timezone
 from mixer.main import Mixer
 
 from adapters.model_adapter import ModelAdapter
@@ -449,6 +452,86 @@ class TestContent:
             assert len(context_posts) == expected_n, (
                 f'Убедитесь, что {tester.on_which_page} работает пагинация.')
 
+    def test_cursor_pagination(
+            self, mixer, user, user_client, published_category):
+        base_date = timezone.now() - timedelta(days=1)
+        posts = mixer.cycle(N_PER_PAGE * 2 + 5).blend(
+            'blog.Post', author=user, category=published_category,
+            is_published=True,
+            pub_date=mixer.sequence(
+                *(base_date - timedelta(hours=i // 3)
+                  for i in range(N_PER_PAGE * 2 + 5))))
+        expected_ids = [
+            post.id for post in sorted(
+                posts, key=lambda post: (post.pub_date, post.id),
+                reverse=True)
+        ]
+
+        seen_ids = []
+        page_sizes = []
+        url = '/'
+        while url:
+            response = user_client.get(url)
+            assert response.status_code == HTTPStatus.OK, (
+                'Убедитесь, что страницы главной ленты загружаются '
+                'без ошибок.')
+            page_obj = response.context['page_obj']
+            page_sizes.append(len(page_obj))
+            seen_ids.extend(post.id for post in page_obj)
+            url = (f'/?after={page_obj.next_cursor}'
+                   if page_obj.has_next() else None)
+
+        assert page_sizes == [N_PER_PAGE, N_PER_PAGE, 5], (
+            'Убедитесь, что на главной странице работает пагинация.')
+        assert seen_ids == expected_ids, (
+            'Убедитесь, что при переходе по страницам главной ленты '
+            'публикации с одинаковой датой не теряются и не повторяются.')
+
+    @pytest.mark.parametrize('cursor', (
+        'abc', '²', '-1', '9223372036854775808', '1_2_3', '1_²',
+        '0_9223372036854775808', '99999999999999999999_1',
+    ))
+    def test_cursor_pagination_bad_cursor(self, user_client, cursor):
+        response = user_client.get(f'/?after={cursor}')
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Убедитесь, что для неверного курсора главная страница '
+            'возвращает статус 404.')
+
+    @pytest.mark.parametrize('cursor_post', ('deleted', 'hidden'))
+    def test_cursor_pagination_continues_past_cursor_post(
+            self, mixer, user, user_client, published_category,
+            cursor_post):
+        base_date = timezone.now() - timedelta(days=1)
+        posts = mixer.cycle(N_PER_PAGE + 5).blend(
+            'blog.Post', author=user, category=published_category,
+            is_published=True,
+            pub_date=mixer.sequence(
+                *(base_date - timedelta(hours=i)
+                  for i in range(N_PER_PAGE + 5))))
+        first_page = user_client.get('/').context['page_obj']
+        last_post = first_page[len(first_page) - 1]
+        if cursor_post == 'deleted':
+            last_post.delete()
+        else:
+            type(last_post).objects.filter(pk=last_post.pk).update(
+                is_published=False)
+
+        response = user_client.get(f'/?after={first_page.next_cursor}')
+        assert response.status_code == HTTPStatus.OK, (
+            'Убедитесь, что главная лента продолжается, даже если последняя '
+            'публикация предыдущей страницы удалена или скрыта.')
+        assert [post.id for post in response.context['page_obj']] == [
+            post.id for post in posts[N_PER_PAGE:]], (
+            'Убедитесь, что вторая страница главной ленты продолжает '
+            'первую с того места, где она закончилась.')
+
+    def test_page_number_redirects_to_feed_start(self, user_client):
+        response = user_client.get('/?page=2')
+        assert response.status_code == HTTPStatus.FOUND
+        assert response.url == '/', (
+            'Убедитесь, что старые ссылки с номером страницы главной ленты '
+            'перенаправляют на её начало.')
+
     def test_image_visible(self, user_client, post_with_published_location):
         post = post_with_published_location
         post_adapter = PostModelAdapter(post)
@@ -478,3 +561,27 @@ class TestContent:
                 f'Убедитесь, что {tester.on_which_page} отображаются '
                 f'изображения {tester.of_which_objs}.'
             )
+
+
+@pytest.mark.parametrize('posts_fixture', (
+    'unpublished_posts_with_published_locations',
+    'future_posts',
+    'posts_with_unpublished_category',
+))
+@pytest.mark.parametrize('viewer, expected_visible', (
+    ('user_client', True),
+    ('another_user_client', False),
+    ('unlogged_client', False),
+))
+def test_profile_hidden_posts_visibility(
+        request, user, posts_fixture, viewer, expected_visible):
+    posts = request.getfixturevalue(posts_fixture)
+    client = request.getfixturevalue(viewer)
+    response = client.get(f'/profile/{user.username}/')
+    context_posts = response.context.get('page_obj')
+    expected_n = len(posts) if expected_visible else 0
+    assert len(context_posts) == expected_n, (
+        'Убедитесь, что на странице пользователя снятые с публикации, '
+        'отложенные публикации и публикации из неопубликованных категорий '
+        'видны только их автору.'
+    )
@@ -11,9 +11,11 @@ import pytz
 from django.db.models import Model, ImageField
 from django.forms import BaseForm
 from django.http import HttpResponse
+from django.urls import reverse
 from django.utils import timezone
 
 from blog.models import Post
+from blog.views import _post_detail_url, _post_detail_url_parts
 from conftest import (
     _TestModelAttrs, KeyVal, get_create_a_post_get_response_safely)
 from adapters.post import PostModelAdapter
@@ -184,3 +186,13 @@ def _test_edit_post(
         user_client=user_client, another_user_client=another_user_client,
         unlogged_client=unlogged_client, file_data=image, **update_props)
     return edit_response, edit_url, del_url
+
+
+@pytest.mark.parametrize('pk', (1, 10, 105, 1000000))
+def test_post_detail_url_matches_reverse(pk):
+    _post_detail_url_parts.cache_clear()
+    assert _post_detail_url(pk) == reverse(
+        'blog:post_detail', kwargs={'pk': pk}), (
+        'Убедитесь, что адрес страницы публикации после редактирования '
+        'публикации или комментария совпадает с адресом из `reverse()`.'
+    )